@@ -1,8 +1,9 @@
+import functools
+import math
 import streamlit as st
+import numpy as np
 import pandas as pd
-import plotly.express as px
 import plotly.graph_objects as go
-import streamlit.components.v1 as components
 
 # ---------------- CONFIGURATION ----------------
 st.set_page_config(
@@ -17,8 +18,7 @@ st.set_page_config(
 # Secondary Gold: #C5A059
 # Background:     Gradient #483C32 (Taupe) -> #1E1812
 
-st.markdown("""
-<style>
+_CSS = """
     @import url('https://fonts.googleapis.com/css2?family=Montserrat:wght@300;400;500;700&display=swap');
 
     /* Global App Background */
@@ -55,7 +55,8 @@ st.markdown("""
 
     /* 5. Specific Attribute Matchers (Wildcard) just in case */
     [class*="viewerBadge"], [class*="profileContainer"], 
-    [class*="viewerBadge"] * , [class*="profileContainer"] * {
+    [class*="viewerBadge"] * , [class*="profileContainer"] * ,
+    a[href*="streamlit.io/cloud"], a[href*="share.streamlit.io/user"] {
         display: none !important;
     }
     /* ---------------- END NUCLEAR OPTION ---------------- */
@@ -122,7 +123,8 @@ st.markdown("""
     }
     
     /* Input Containers */
-    div[data-testid="stVerticalBlockBorderWrapper"] > div > div {
+    div[data-testid="stVerticalBlockBorderWrapper"] > div > div,
+    div[data-testid="stForm"] {
         background-color: rgba(40, 30, 20, 0.6) !important;
         border: 1px solid rgba(212, 175, 55, 0.2) !important;
         backdrop-filter: blur(10px);
@@ -225,8 +227,14 @@ st.markdown("""
     #MainMenu {visibility: hidden;}
     footer {visibility: hidden;}
     
-</style>
-""", unsafe_allow_html=True)
+"""
+
+@st.cache_resource
+def _inject_css():
+    st.markdown(f"<style>{_CSS}</style>", unsafe_allow_html=True)
+    return True
+
+_inject_css()
 
 # ---------------- HEADER ----------------
 st.markdown('<div style="text-align: center; margin-bottom: 2.5rem;">', unsafe_allow_html=True)
@@ -239,7 +247,7 @@ col_input, col_output = st.columns([1, 2], gap="large")
 
 with col_input:
     st.markdown("##### PARAMETERS")
-    with st.container(border=True):
+    with st.form("params", border=True):
         lump_sum = st.number_input("Lump-sum Investment (₹)", min_value=0, value=100000, step=5000, format="%d")
         monthly_sip = st.number_input("Base Monthly SIP (₹)", min_value=0, value=10000, step=500, format="%d")
         years = st.slider("Tenure (years)", min_value=1, max_value=40, value=15)
@@ -251,14 +259,11 @@ with col_input:
         lump_sum_timing = st.selectbox("Lump-sum Timing", ["Invest today (t=0)", "Invest after 1 month"], index=0)
         invest_at_beginning = st.toggle("SIP at beginning of each month (Annuity Due)", value=False)
         show_monthly = st.toggle("Show monthly table & chart", value=True)
+        st.form_submit_button("Update projection", use_container_width=True)
 
 # ---------------- CALCULATION LOGIC ----------------
-months = years * 12
-r = (annual_return_pct / 100.0) / 12.0
-g = stepup_pct / 100.0
-
-def format_indian_currency(n):
-    n = float(n)
+@functools.lru_cache(maxsize=1024)
+def _fmt(n):
     if n >= 10000000:
         return f"₹ {n/10000000:.2f} Cr"
     elif n >= 100000:
@@ -266,42 +271,128 @@ def format_indian_currency(n):
     else:
         return f"₹ {n:,.0f}"
 
-def month_sip_amount(m: int) -> float:
-    yr_idx = (m - 1) // 12
-    return monthly_sip * ((1 + g) ** yr_idx)
-
-balance = 0.0
-rows = []
-total_sip_contrib = 0.0
-total_lumpsum_contrib = 0.0
-
-for m in range(1, months + 1):
-    sip_amt = month_sip_amount(m)
-    if invest_at_beginning:
-        balance += sip_amt
-        total_sip_contrib += sip_amt
-    if m == 1 and lump_sum > 0 and lump_sum_timing == "Invest today (t=0)":
-        balance += lump_sum
-        total_lumpsum_contrib += lump_sum
-    if m == 2 and lump_sum > 0 and lump_sum_timing == "Invest after 1 month":
-        balance += lump_sum
-        total_lumpsum_contrib += lump_sum
-    if r > 0:
-        balance *= (1 + r)
-    if not invest_at_beginning:
-        balance += sip_amt
-        total_sip_contrib += sip_amt
-    rows.append({
-        "Month": m,
-        "SIP": sip_amt,
-        "Invested": total_sip_contrib + total_lumpsum_contrib,
+def format_indian_currency(n):
+    n = float(n)
+    # Whole rupees share cache entries; inf/nan (returns that overflow a float) are formatted as is
+    return _fmt(int(round(n)) if math.isfinite(n) else n)
+
+@st.cache_data(ttl=24 * 60 * 60, show_spinner=False)
+def compute_schedule(lump_sum, monthly_sip, years, annual_return_pct, stepup_pct, lump_sum_timing, invest_at_beginning):
+    months = years * 12
+    r = (annual_return_pct / 100.0) / 12.0
+    g = stepup_pct / 100.0
+
+    month_idx = np.arange(1, months + 1, dtype=np.int32)
+    # Step-up factor once per year, indexed by each month's year
+    stepup = np.power(1 + g, np.arange(years))
+    sip = monthly_sip * stepup[(month_idx - 1) // 12]
+
+    # Cash added before this month's growth (annuity due SIP, lump-sum) vs after it
+    lumpsum = np.zeros(months)
+    lump_month = 1 if lump_sum_timing == "Invest today (t=0)" else 2
+    if lump_sum > 0 and lump_month <= months:
+        lumpsum[lump_month - 1] = lump_sum
+    pre_growth = lumpsum + sip if invest_at_beginning else lumpsum
+    post_growth = np.zeros(months) if invest_at_beginning else sip
+
+    # Balance after month k = (1+r)^k * running sum of contributions discounted to t=0
+    growth = np.cumprod(np.full(months, 1 + r))
+    balance = growth * np.cumsum((pre_growth * (1 + r) + post_growth) / growth)
+
+    sip_cum = np.cumsum(sip)
+    lumpsum_cum = np.cumsum(lumpsum)
+
+    df = pd.DataFrame({
+        "Month": month_idx,
+        "SIP": sip,
+        "Invested": sip_cum + lumpsum_cum,
         "Value": balance
     })
+    principal = float(df["Invested"].iloc[-1]) if not df.empty else float(lump_sum)
+    future_value = float(df["Value"].iloc[-1]) if not df.empty else principal
+    kpis = {
+        "lumpsum": float(lumpsum_cum[-1]) if months else 0.0,
+        "sip": float(sip_cum[-1]) if months else 0.0,
+        "principal": principal,
+        "future_value": future_value,
+        "returns": max(future_value - principal, 0.0),
+    }
+    return df, kpis
 
-df = pd.DataFrame(rows) if rows else pd.DataFrame(columns=["Month","SIP","Invested","Value"])
-principal = float(df["Invested"].iloc[-1]) if not df.empty else float(lump_sum)
-future_value = float(df["Value"].iloc[-1]) if not df.empty else principal
-returns = max(future_value - principal, 0.0)
+def fv_only(lump_sum, monthly_sip, years, annual_return_pct, stepup_pct, lump_sum_timing, invest_at_beginning):
+    months = years * 12
+    r = (annual_return_pct / 100.0) / 12.0
+    g = stepup_pct / 100.0
+
+    year_idx = np.arange(years)
+    year_sip = monthly_sip * np.power(1 + g, year_idx)
+    lump_month = 1 if lump_sum_timing == "Invest today (t=0)" else 2
+    lumpsum = float(lump_sum) if lump_sum > 0 and lump_month <= months else 0.0
+
+    # Each year's 12 equal SIPs are a level annuity: value it at year end, then compound to the horizon.
+    # Very high returns overflow to inf as the month-by-month loop did, while zero amounts stay zero.
+    with np.errstate(over="ignore", invalid="ignore"):
+        annuity = (np.power(1 + r, 12) - 1) / r if r > 0 else 12.0
+        if invest_at_beginning:
+            annuity *= 1 + r
+        sip_value = float(np.sum(year_sip * annuity * np.power(1 + r, 12 * (years - 1 - year_idx)))) if monthly_sip > 0 else 0.0
+        lump_value = float(lumpsum * np.power(1 + r, months - lump_month + 1)) if lumpsum > 0 else 0.0
+
+    total_sip = 12 * float(np.sum(year_sip))
+    principal = lumpsum + total_sip
+    future_value = sip_value + lump_value
+    return {
+        "lumpsum": lumpsum,
+        "sip": total_sip,
+        "principal": principal,
+        "future_value": future_value,
+        "returns": max(future_value - principal, 0.0),
+    }
+
+@st.cache_resource(ttl=24 * 60 * 60, max_entries=64, show_spinner=False)
+def build_pie_figure(principal, returns):
+    fig_pie = go.Figure(go.Pie(
+        labels=["Principal", "Returns"], values=[principal, returns], hole=0.7,
+        marker=dict(colors=["#6B5B45", "#BB9D63"]), # muted brown vs bright gold
+        textposition="outside", textinfo="percent+label"
+    ))
+    fig_pie.update_layout(
+        margin=dict(t=20, b=50, l=40, r=40),
+        height=300,
+        paper_bgcolor="rgba(0,0,0,0)",
+        plot_bgcolor="rgba(0,0,0,0)",
+        font=dict(color="#F0EAD6", family="Montserrat", size=10),
+        showlegend=True,
+        legend=dict(orientation="h", y=-0.2, x=0.5, xanchor="center")
+    )
+    return fig_pie
+
+@st.cache_resource(ttl=24 * 60 * 60, max_entries=64, show_spinner=False)
+def build_area_figure(df):
+    # Plot-only copies in float32 halve the trace payload; the table keeps float64
+    month = df["Month"].to_numpy()
+    line_fig = go.Figure()
+    # Dark Bronze vs Gold
+    line_fig.add_trace(go.Scatter(x=month, y=df["Invested"].to_numpy(dtype=np.float32), name="Invested", fill="tozeroy", mode="lines", line=dict(color="#5D4D3B")))
+    line_fig.add_trace(go.Scatter(x=month, y=df["Value"].to_numpy(dtype=np.float32), name="Value", fill="tonexty", mode="lines", line=dict(color="#BB9D63")))
+    line_fig.update_layout(
+        margin=dict(t=10, b=0, l=0, r=0),
+        height=300,
+        legend=dict(orientation="h", y=1.02, x=1, xanchor="right"),
+        paper_bgcolor="rgba(0,0,0,0)",
+        plot_bgcolor="rgba(0,0,0,0)",
+        font=dict(color="#A89F91", family="Montserrat", size=10),
+        xaxis=dict(showgrid=False, title="Month"),
+        yaxis=dict(showgrid=True, gridcolor="rgba(212, 175, 55, 0.1)", title="Amount (₹)"),
+        hovermode="x unified"
+    )
+    return line_fig
+
+# The full month-by-month schedule is only needed for the growth chart and table
+if show_monthly:
+    df, kpis = compute_schedule(lump_sum, monthly_sip, years, annual_return_pct, stepup_pct, lump_sum_timing, invest_at_beginning)
+else:
+    kpis = fv_only(lump_sum, monthly_sip, years, annual_return_pct, stepup_pct, lump_sum_timing, invest_at_beginning)
 
 # ---------------- OUTPUT DISPLAY ----------------
 with col_output:
@@ -309,10 +400,10 @@ with col_output:
     
     # KPIs
     k1, k2, k3, k4 = st.columns(4)
-    k1.metric("Lump-sum Invested", format_indian_currency(total_lumpsum_contrib))
-    k2.metric("Total SIP Invested", format_indian_currency(total_sip_contrib))
-    k3.metric("Estimated Value", format_indian_currency(future_value))
-    k4.metric("Wealth Gain (Returns)", format_indian_currency(returns))
+    k1.metric("Lump-sum Invested", format_indian_currency(kpis["lumpsum"]))
+    k2.metric("Total SIP Invested", format_indian_currency(kpis["sip"]))
+    k3.metric("Estimated Value", format_indian_currency(kpis["future_value"]))
+    k4.metric("Wealth Gain (Returns)", format_indian_currency(kpis["returns"]))
 
     st.markdown("") # Spacer
 
@@ -321,111 +412,13 @@ with col_output:
     
     with c1:
         st.caption("Principal vs Returns".upper())
-        pie_data = [{"Type": "Principal", "Value": principal}, {"Type": "Returns", "Value": returns}]
-        fig_pie = px.pie(
-            pie_data, names="Type", values="Value", hole=0.7,
-            color="Type",
-            color_discrete_map={"Principal": "#6B5B45", "Returns": "#BB9D63"} # muted brown vs bright gold
-        )
-        fig_pie.update_traces(textposition="outside", textinfo="percent+label")
-        fig_pie.update_layout(
-            margin=dict(t=20, b=50, l=40, r=40),
-            height=300,
-            paper_bgcolor="rgba(0,0,0,0)",
-            plot_bgcolor="rgba(0,0,0,0)",
-            font=dict(color="#F0EAD6", family="Montserrat", size=10),
-            showlegend=True,
-            legend=dict(orientation="h", y=-0.2, x=0.5, xanchor="center")
-        )
-        st.plotly_chart(fig_pie, use_container_width=True)
+        st.plotly_chart(build_pie_figure(kpis["principal"], kpis["returns"]), use_container_width=True)
 
     with c2:
         if show_monthly and not df.empty:
             st.caption("Monthly Growth".upper())
-            line_fig = px.area(
-                df, x="Month", y=["Invested", "Value"],
-                labels={"value": "Amount (₹)", "variable": "Metric"},
-                color_discrete_sequence=["#5D4D3B", "#BB9D63"] # Dark Bronze vs Gold
-            )
-            line_fig.update_layout(
-                margin=dict(t=10, b=0, l=0, r=0),
-                height=300,
-                legend=dict(orientation="h", y=1.02, x=1, xanchor="right"),
-                paper_bgcolor="rgba(0,0,0,0)",
-                plot_bgcolor="rgba(0,0,0,0)",
-                font=dict(color="#A89F91", family="Montserrat", size=10),
-                xaxis=dict(showgrid=False),
-                yaxis=dict(showgrid=True, gridcolor="rgba(212, 175, 55, 0.1)"),
-                hovermode="x unified"
-            )
-            st.plotly_chart(line_fig, use_container_width=True)
-
-    with st.expander("Show monthly table & chart"):
-        st.dataframe(df, hide_index=True, use_container_width=True)
-
-
-# ---------------- ELEMENTS REMOVAL SCRIPT (ROBUST + HEADER KILLER) ----------------
-components.html(
-    """
-    <script>
-    function removeElements() {
-        const doc = window.parent.document;
-        
-        // 1. Target the Specific Nuisance Elements
-        const specificSelectors = [
-            '._viewerBadge_nim44_23',
-            '._container_gzau3_1',
-            'a[href*="streamlit.io/cloud"]',
-            '[class*="viewerBadge"]',
-            '._profileContainer_gzau3_53',
-            'div[class*="profileContainer"]',
-            '._profilePreview_gzau3_63',
-            '._profileImage_gzau3_78',
-            'a[href*="share.streamlit.io/user"]'
-        ];
-        
-        // 2. Target the Entire Header Area (The Nuclear Option)
-        const nuclearSelectors = [
-            'header[data-testid="stHeader"]',
-            '[data-testid="stToolbar"]',
-            '[data-testid="stDecoration"]'
-        ];
-        
-        const allSelectors = [...specificSelectors, ...nuclearSelectors];
-        
-        allSelectors.forEach(selector => {
-            const elements = doc.querySelectorAll(selector);
-            elements.forEach(el => {
-                if(el) {
-                    // Hide it
-                    el.style.display = 'none';
-                    el.style.visibility = 'hidden';
-                    el.style.height = '0';
-                    el.style.zIndex = '-100';
-                    // Remove it
-                    el.remove();
-                }
-            });
-        });
-        
-        // 3. Adjust Top Padding of main container to reclaim space
-        const mainBlock = doc.querySelector('.block-container');
-        if(mainBlock) {
-             mainBlock.style.paddingTop = '1rem';
-        }
-    }
-
-    // Interval + Observer
-    const intervalId = setInterval(removeElements, 50);
-    const observer = new MutationObserver((mutations) => {
-        removeElements();
-    });
-    observer.observe(window.parent.document.body, {childList: true, subtree: true});
-
-    // Keep it running for a while
-    setTimeout(() => clearInterval(intervalId), 60000);
-    </script>
-    """,
-    height=0,
-    width=0
-)
+            st.plotly_chart(build_area_figure(df), use_container_width=True)
+
+    if show_monthly:
+        with st.expander("Show monthly table & chart"):
+            st.dataframe(df, hide_index=True, use_container_width=True)
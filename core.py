@@ -0,0 +1,350 @@
+# core.py
+import functools
+import io
+import math
+import streamlit as st
+import numpy as np
+import pandas as pd
+import pyarrow as pa
+import pyarrow.csv
+import plotly.graph_objects as go
+
+# ---------------- THEME & STYLING ----------------
+# Refined "Luxury Bronze" Palette
+# Primary Gold:   #BB9D63
+# Secondary Gold: #C5A059
+# Background:     Gradient #483C32 (Taupe) -> #1E1812
+
+_CSS = """
+    @import url('https://fonts.googleapis.com/css2?family=Montserrat:wght@300;400;500;700&display=swap');
+
+    /* Global App Background */
+    .stApp {
+        background: radial-gradient(circle at 50% 10%, #4D4134 0%, #1F1913 100%);
+        color: #F0EAD6; /* Eggshell/Parchment */
+        font-family: 'Montserrat', sans-serif;
+    }
+
+    /* ---------------- NUCLEAR OPTION: HEADER REMOVAL ---------------- */
+    /* 1. Hide the entire top header bar (contains the badge, profile, hamburger menu) */
+    header, [data-testid="stHeader"] {
+        display: none !important;
+        visibility: hidden !important;
+        height: 0px !important;
+        z-index: -1 !important;
+    }
+    
+    /* 2. Hide the Toolbar (Three dots / Options menu) */
+    [data-testid="stToolbar"] {
+        display: none !important;
+        right: 9999px !important;
+    }
+    
+    /* 3. Hide Decoration (Colored line at top) */
+    [data-testid="stDecoration"] {
+        display: none !important;
+    }
+    
+    /* 4. Shift Main Content Up (Reclaim the empty space) */
+    .block-container {
+        padding-top: 1rem !important; /* Default is often 5rem+ */
+    }
+
+    /* 5. Specific Attribute Matchers (Wildcard) just in case */
+    [class*="viewerBadge"], [class*="profileContainer"], 
+    [class*="viewerBadge"] * , [class*="profileContainer"] * ,
+    a[href*="streamlit.io/cloud"], a[href*="share.streamlit.io/user"] {
+        display: none !important;
+    }
+    /* ---------------- END NUCLEAR OPTION ---------------- */
+
+
+    /* Custom Header */
+    .brand-header {
+        font-family: 'Montserrat', sans-serif;
+        font-weight: 700;
+        color: #BB9D63;
+        text-transform: uppercase;
+        letter-spacing: 3px;
+        margin-bottom: 5px;
+        text-align: center;
+        text-shadow: 0px 2px 4px rgba(0,0,0,0.3);
+    }
+    .brand-sub {
+        font-family: 'Montserrat', sans-serif;
+        font-weight: 400;
+        color: #E0DACC;
+        text-align: center;
+        margin-bottom: 30px;
+        font-size: 0.9rem;
+        letter-spacing: 1px;
+    }
+
+    /* Input Styling */
+    .stInput > label, .stSlider > label, .stSelectbox > label, .stNumberInput > label {
+        color: #ffffff !important;
+        font-weight: 600;
+        text-transform: uppercase;
+        letter-spacing: 0.5px;
+        font-size: 0.75rem;
+    }
+    
+    /* Input Fields Background */
+    input.st-ai, div[data-baseweb="select"] > div {
+        background-color: rgba(255, 255, 255, 0.05) !important;
+        border: 1px solid rgba(212, 175, 55, 0.3) !important;
+        color: white !important;
+    }
+    
+    /* Center "Press Enter to apply" text */
+    div[data-testid="InputInstructions"] > span {
+        display: flex;
+        justify-content: center;
+        width: 100%;
+        text-align: center;
+    }
+    
+    /* User specific fix for input instruction positioning */
+    .st-emotion-cache-mi7yog {
+        bottom: 10px !important;
+    }
+    
+
+    
+
+    
+    /* Input Containers */
+    div[data-testid="stVerticalBlockBorderWrapper"] > div > div,
+    div[data-testid="stForm"] {
+        background-color: rgba(40, 30, 20, 0.6) !important;
+        border: 1px solid rgba(212, 175, 55, 0.2) !important;
+        backdrop-filter: blur(10px);
+        border-radius: 4px;
+    }
+
+    /* Metric Cards */
+    div[data-testid="stMetric"] {
+        background-color: rgba(255, 255, 255, 0.03) !important;
+        border: 1px solid rgba(212, 175, 55, 0.15) !important;
+        padding: 15px;
+        border-radius: 4px;
+    }
+    
+    /* Metric Typography */
+    div[data-testid="stMetric"] label[data-testid="stMetricLabel"] {
+        color: #A89F91 !important;
+        font-family: 'Montserrat', sans-serif;
+        text-transform: uppercase;
+        font-size: 0.7rem;
+        letter-spacing: 1px;
+    }
+    div[data-testid="stMetric"] div[data-testid="stMetricValue"] {
+        color: #FDFBF7 !important;
+        font-family: 'Montserrat', sans-serif;
+        font-weight: 500;
+        font-size: 1.2rem !important;
+        text-shadow: 0 0 10px rgba(212, 175, 55, 0.2);
+    }
+
+
+    
+
+
+
+    
+
+    
+    /* Slider Track Background */
+    div[data-baseweb="slider"] > div > div {
+        background: #483C32 !important;
+    }
+    
+    /* Slider Thumb */
+    div[role="slider"] {
+        border: none !important;
+    }
+
+    
+
+    
+    /* Headers */
+    h1, h2, h3, h4, h5 {
+        color: #F0EAD6 !important;
+        font-family: 'Montserrat', sans-serif;
+        font-weight: 500;
+    }
+    
+    /* Hide Default Elements */
+    #MainMenu {visibility: hidden;}
+    footer {visibility: hidden;}
+    
+"""
+
+@st.cache_resource
+def inject_css():
+    st.markdown(f"<style>{_CSS}</style>", unsafe_allow_html=True)
+    return True
+
+# ---------------- CALCULATION LOGIC ----------------
+@functools.lru_cache(maxsize=1024)
+def _fmt(n):
+    if n >= 10000000:
+        return f"₹ {n/10000000:.2f} Cr"
+    elif n >= 100000:
+        return f"₹ {n/100000:.2f} L"
+    else:
+        return f"₹ {n:,.0f}"
+
+def format_indian_currency(n):
+    n = float(n)
+    # Whole rupees share cache entries; inf/nan (returns that overflow a float) are formatted as is
+    return _fmt(int(round(n)) if math.isfinite(n) else n)
+
+@st.cache_data(ttl=24 * 60 * 60, show_spinner=False)
+def compute_schedule(lump_sum, monthly_sip, years, annual_return_pct, stepup_pct, lump_sum_timing, invest_at_beginning):
+    months = years * 12
+    r = (annual_return_pct / 100.0) / 12.0
+    g = stepup_pct / 100.0
+
+    month_idx = np.arange(1, months + 1, dtype=np.int32)
+    # Step-up factor once per year, indexed by each month's year
+    stepup = np.power(1 + g, np.arange(years))
+    sip = monthly_sip * stepup[(month_idx - 1) // 12]
+
+    # Cash added before this month's growth (annuity due SIP, lump-sum) vs after it
+    lumpsum = np.zeros(months)
+    lump_month = 1 if lump_sum_timing == "Invest today (t=0)" else 2
+    if lump_sum > 0 and lump_month <= months:
+        lumpsum[lump_month - 1] = lump_sum
+    pre_growth = lumpsum + sip if invest_at_beginning else lumpsum
+    post_growth = np.zeros(months) if invest_at_beginning else sip
+
+    # Balance after month k = (1+r)^k * running sum of contributions discounted to t=0
+    growth = np.cumprod(np.full(months, 1 + r))
+    balance = growth * np.cumsum((pre_growth * (1 + r) + post_growth) / growth)
+
+    sip_cum = np.cumsum(sip)
+    lumpsum_cum = np.cumsum(lumpsum)
+
+    df = pd.DataFrame({
+        "Month": month_idx,
+        "SIP this month (₹)": sip,
+        "Cumulative SIP (₹)": sip_cum,
+        "Cumulative Lump-sum (₹)": lumpsum_cum,
+        "Total Principal (₹)": sip_cum + lumpsum_cum,
+        "Estimated Value (₹)": balance
+    })
+    principal = float(df["Total Principal (₹)"].iloc[-1]) if not df.empty else float(lump_sum)
+    future_value = float(df["Estimated Value (₹)"].iloc[-1]) if not df.empty else principal
+    kpis = {
+        "lumpsum": float(lumpsum_cum[-1]) if months else 0.0,
+        "sip": float(sip_cum[-1]) if months else 0.0,
+        "principal": principal,
+        "future_value": future_value,
+        "returns": max(future_value - principal, 0.0),
+    }
+    return df, kpis
+
+def fv_only(lump_sum, monthly_sip, years, annual_return_pct, stepup_pct, lump_sum_timing, invest_at_beginning):
+    months = years * 12
+    r = (annual_return_pct / 100.0) / 12.0
+    g = stepup_pct / 100.0
+
+    year_idx = np.arange(years)
+    year_sip = monthly_sip * np.power(1 + g, year_idx)
+    lump_month = 1 if lump_sum_timing == "Invest today (t=0)" else 2
+    lumpsum = float(lump_sum) if lump_sum > 0 and lump_month <= months else 0.0
+
+    # Each year's 12 equal SIPs are a level annuity: value it at year end, then compound to the horizon.
+    # Very high returns overflow to inf as the month-by-month loop did, while zero amounts stay zero.
+    with np.errstate(over="ignore", invalid="ignore"):
+        annuity = (np.power(1 + r, 12) - 1) / r if r > 0 else 12.0
+        if invest_at_beginning:
+            annuity *= 1 + r
+        sip_value = float(np.sum(year_sip * annuity * np.power(1 + r, 12 * (years - 1 - year_idx)))) if monthly_sip > 0 else 0.0
+        lump_value = float(lumpsum * np.power(1 + r, months - lump_month + 1)) if lumpsum > 0 else 0.0
+
+    total_sip = 12 * float(np.sum(year_sip))
+    principal = lumpsum + total_sip
+    future_value = sip_value + lump_value
+    return {
+        "lumpsum": lumpsum,
+        "sip": total_sip,
+        "principal": principal,
+        "future_value": future_value,
+        "returns": max(future_value - principal, 0.0),
+    }
+
+def _plain_decimals(values):
+    # pyarrow writes doubles of 1e10 and up in exponent notation, so amounts go out as fixed 2-decimal
+    # text instead; inf stays "inf" and nan is left empty, as DataFrame.to_csv wrote them
+    text = np.char.mod("%.2f", values)
+    text[np.isnan(values)] = ""
+    return text
+
+@st.cache_data(ttl=24 * 60 * 60, max_entries=64, show_spinner=False)
+def schedule_csv(df):
+    amounts = df.select_dtypes("floating").columns
+    table = pa.Table.from_pandas(df.assign(**{c: _plain_decimals(df[c].to_numpy()) for c in amounts}), preserve_index=False)
+    buf = io.BytesIO()
+    buf.write("\ufeff".encode("utf-8"))  # BOM, as with utf-8-sig, so Excel reads the ₹ headers
+    pa.csv.write_csv(table, buf, pa.csv.WriteOptions(quoting_style="none"))
+    return buf.getvalue()
+
+@st.cache_resource(ttl=24 * 60 * 60, max_entries=64, show_spinner=False)
+def build_pie_figure(principal, returns):
+    fig_pie = go.Figure(go.Pie(
+        labels=["Principal", "Returns"], values=[principal, returns], hole=0.7,
+        marker=dict(colors=["#6B5B45", "#BB9D63"]), # muted brown vs bright gold
+        textposition="outside", textinfo="percent+label"
+    ))
+    fig_pie.update_layout(
+        margin=dict(t=20, b=50, l=40, r=40),
+        height=300,
+        paper_bgcolor="rgba(0,0,0,0)",
+        plot_bgcolor="rgba(0,0,0,0)",
+        font=dict(color="#F0EAD6", family="Montserrat", size=10),
+        showlegend=True,
+        legend=dict(orientation="h", y=-0.2, x=0.5, xanchor="center")
+    )
+    return fig_pie
+
+# Set once a static export fails (no kaleido or headless Chrome) so later reruns skip straight to the chart
+_pie_png_unavailable = False
+
+@st.cache_data(show_spinner=False)
+def _render_pie_png(returns_pct):
+    # The static pie only shows the percent split, so 0.1% buckets cap the cache at 1001 renders
+    return build_pie_figure(100.0 - returns_pct, returns_pct).to_image(format="png", width=400, height=300, scale=2)
+
+def pie_png(principal, returns):
+    global _pie_png_unavailable
+    total = principal + returns
+    if _pie_png_unavailable or total <= 0:
+        return None
+    try:
+        return _render_pie_png(round(100.0 * returns / total, 1))
+    except (RuntimeError, ValueError):
+        _pie_png_unavailable = True
+        return None
+
+@st.cache_resource(ttl=24 * 60 * 60, max_entries=64, show_spinner=False)
+def build_area_figure(df):
+    # Plot-only copies in float32 halve the trace payload; the table keeps float64
+    month = df["Month"].to_numpy()
+    line_fig = go.Figure()
+    # Dark Bronze vs Gold
+    line_fig.add_trace(go.Scatter(x=month, y=df["Total Principal (₹)"].to_numpy(dtype=np.float32), name="Total Principal (₹)", fill="tozeroy", mode="lines", line=dict(color="#5D4D3B")))
+    line_fig.add_trace(go.Scatter(x=month, y=df["Estimated Value (₹)"].to_numpy(dtype=np.float32), name="Estimated Value (₹)", fill="tonexty", mode="lines", line=dict(color="#BB9D63")))
+    line_fig.update_layout(
+        margin=dict(t=10, b=0, l=0, r=0),
+        height=300,
+        legend=dict(orientation="h", y=1.02, x=1, xanchor="right"),
+        paper_bgcolor="rgba(0,0,0,0)",
+        plot_bgcolor="rgba(0,0,0,0)",
+        font=dict(color="#A89F91", family="Montserrat", size=10),
+        xaxis=dict(showgrid=False, title="Month"),
+        yaxis=dict(showgrid=True, gridcolor="rgba(212, 175, 55, 0.1)", title="Amount (₹)"),
+        hovermode="x unified"
+    )
+    return line_fig
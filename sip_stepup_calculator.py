@@ -1,8 +1,14 @@
 import streamlit as st
-import pandas as pd
-import plotly.express as px
-import plotly.graph_objects as go
-import streamlit.components.v1 as components
+from core import (
+    build_area_figure,
+    build_pie_figure,
+    compute_schedule,
+    format_indian_currency,
+    fv_only,
+    inject_css,
+    pie_png,
+    schedule_csv,
+)
 
 # ---------------- CONFIGURATION ----------------
 st.set_page_config(
@@ -11,176 +17,7 @@ st.set_page_config(
     layout="wide"
 )
 
-# ---------------- THEME & STYLING ----------------
-# Refined "Luxury Bronze" Palette
-# Primary Gold:   #BB9D63
-# Secondary Gold: #C5A059
-# Background:     Gradient #483C32 (Taupe) -> #1E1812
-
-st.markdown("""
-<style>
-    @import url('https://fonts.googleapis.com/css2?family=Montserrat:wght@300;400;500;700&display=swap');
-
-    /* Global App Background */
-    .stApp {
-        background: radial-gradient(circle at 50% 10%, #4D4134 0%, #1F1913 100%);
-        color: #F0EAD6; /* Eggshell/Parchment */
-        font-family: 'Montserrat', sans-serif;
-    }
-
-    /* ---------------- NUCLEAR OPTION: HEADER REMOVAL ---------------- */
-    /* 1. Hide the entire top header bar (contains the badge, profile, hamburger menu) */
-    header, [data-testid="stHeader"] {
-        display: none !important;
-        visibility: hidden !important;
-        height: 0px !important;
-        z-index: -1 !important;
-    }
-    
-    /* 2. Hide the Toolbar (Three dots / Options menu) */
-    [data-testid="stToolbar"] {
-        display: none !important;
-        right: 9999px !important;
-    }
-    
-    /* 3. Hide Decoration (Colored line at top) */
-    [data-testid="stDecoration"] {
-        display: none !important;
-    }
-    
-    /* 4. Shift Main Content Up (Reclaim the empty space) */
-    .block-container {
-        padding-top: 1rem !important; /* Default is often 5rem+ */
-    }
-
-    /* 5. Specific Attribute Matchers (Wildcard) just in case */
-    [class*="viewerBadge"], [class*="profileContainer"], 
-    [class*="viewerBadge"] * , [class*="profileContainer"] * {
-        display: none !important;
-    }
-    /* ---------------- END NUCLEAR OPTION ---------------- */
-
-
-    /* Custom Header */
-    .brand-header {
-        font-family: 'Montserrat', sans-serif;
-        font-weight: 700;
-        color: #BB9D63;
-        text-transform: uppercase;
-        letter-spacing: 3px;
-        margin-bottom: 5px;
-        text-align: center;
-        text-shadow: 0px 2px 4px rgba(0,0,0,0.3);
-    }
-    .brand-sub {
-        font-family: 'Montserrat', sans-serif;
-        font-weight: 400;
-        color: #E0DACC;
-        text-align: center;
-        margin-bottom: 30px;
-        font-size: 0.9rem;
-        letter-spacing: 1px;
-    }
-
-    /* Input Styling */
-    .stInput > label, .stSlider > label, .stSelectbox > label, .stNumberInput > label {
-        color: #ffffff !important;
-        font-weight: 600;
-        text-transform: uppercase;
-        letter-spacing: 0.5px;
-        font-size: 0.75rem;
-    }
-    
-    /* Input Fields Background */
-    input.st-ai, div[data-baseweb="select"] > div {
-        background-color: rgba(255, 255, 255, 0.05) !important;
-        border: 1px solid rgba(212, 175, 55, 0.3) !important;
-        color: white !important;
-    }
-    
-    /* Center "Press Enter to apply" text */
-    div[data-testid="InputInstructions"] > span {
-        display: flex;
-        justify-content: center;
-        width: 100%;
-        text-align: center;
-    }
-    
-    /* User specific fix for input instruction positioning */
-    .st-emotion-cache-mi7yog {
-        bottom: 10px !important;
-    }
-    
-
-    
-
-    
-    /* Input Containers */
-    div[data-testid="stVerticalBlockBorderWrapper"] > div > div {
-        background-color: rgba(40, 30, 20, 0.6) !important;
-        border: 1px solid rgba(212, 175, 55, 0.2) !important;
-        backdrop-filter: blur(10px);
-        border-radius: 4px;
-    }
-
-    /* Metric Cards */
-    div[data-testid="stMetric"] {
-        background-color: rgba(255, 255, 255, 0.03) !important;
-        border: 1px solid rgba(212, 175, 55, 0.15) !important;
-        padding: 15px;
-        border-radius: 4px;
-    }
-    
-    /* Metric Typography */
-    div[data-testid="stMetric"] label[data-testid="stMetricLabel"] {
-        color: #A89F91 !important;
-        font-family: 'Montserrat', sans-serif;
-        text-transform: uppercase;
-        font-size: 0.7rem;
-        letter-spacing: 1px;
-    }
-    div[data-testid="stMetric"] div[data-testid="stMetricValue"] {
-        color: #FDFBF7 !important;
-        font-family: 'Montserrat', sans-serif;
-        font-weight: 500;
-        font-size: 1.2rem !important;
-        text-shadow: 0 0 10px rgba(212, 175, 55, 0.2);
-    }
-
-
-    
-
-
-
-    
-
-    
-    /* Slider Track Background */
-    div[data-baseweb="slider"] > div > div {
-        background: #483C32 !important;
-    }
-    
-    /* Slider Thumb */
-    div[role="slider"] {
-        border: none !important;
-    }
-
-    
-
-    
-    /* Headers */
-    h1, h2, h3, h4, h5 {
-        color: #F0EAD6 !important;
-        font-family: 'Montserrat', sans-serif;
-        font-weight: 500;
-    }
-    
-    /* Hide Default Elements */
-    #MainMenu {visibility: hidden;}
-    footer {visibility: hidden;}
-    
-</style>
-""", unsafe_allow_html=True)
+inject_css()
 
 # ---------------- HEADER ----------------
 st.markdown('<div style="text-align: center; margin-bottom: 2.5rem;">', unsafe_allow_html=True)
@@ -193,7 +30,7 @@ col_input, col_output = st.columns([1, 2], gap="large")
 
 with col_input:
     st.markdown("##### PARAMETERS")
-    with st.container(border=True):
+    with st.form("params", border=True):
         lump_sum = st.number_input("Lump-sum Investment (₹)", min_value=0, value=100000, step=5000, format="%d")
         monthly_sip = st.number_input("Base Monthly SIP (₹)", min_value=0, value=10000, step=500, format="%d")
         years = st.slider("Tenure (years)", min_value=1, max_value=40, value=15)
@@ -204,61 +41,23 @@ with col_input:
         stepup_pct = st.number_input("SIP Step-up per Year (%)", min_value=0.0, value=10.0, step=0.5, format="%.2f")
         lump_sum_timing = st.selectbox("Lump-sum Timing", ["Invest today (t=0)", "Invest after 1 month"], index=0)
         invest_at_beginning = st.toggle("SIP at beginning of each month (Annuity Due)", value=False)
-        show_monthly = st.toggle("Show monthly schedule table", value=True)
-
+        show_monthly = st.toggle("Show monthly table & chart", value=True)
+        st.form_submit_button("Update projection", use_container_width=True)
 
 # ---------------- CALCULATION LOGIC ----------------
-months = years * 12
-r = (annual_return_pct / 100.0) / 12.0
-g = stepup_pct / 100.0
-
-def format_indian_currency(n):
-    n = float(n)
-    if n >= 10000000:
-        return f"₹ {n/10000000:.2f} Cr"
-    elif n >= 100000:
-        return f"₹ {n/100000:.2f} L"
-    else:
-        return f"₹ {n:,.0f}"
+# Reuse the last projection when only the display toggle changed since the previous run
+projection_inputs = (lump_sum, monthly_sip, years, annual_return_pct, stepup_pct, lump_sum_timing, invest_at_beginning)
+if st.session_state.get("projection_inputs") != projection_inputs:
+    st.session_state["projection_inputs"] = projection_inputs
+    st.session_state["kpis"] = fv_only(*projection_inputs)
+    st.session_state.pop("schedule", None)
 
-def month_sip_amount(m: int) -> float:
-    yr_idx = (m - 1) // 12
-    return monthly_sip * ((1 + g) ** yr_idx)
+# The full month-by-month schedule is only needed for the growth chart and table
+if show_monthly and "schedule" not in st.session_state:
+    st.session_state["schedule"], _ = compute_schedule(*projection_inputs)
 
-balance = 0.0
-rows = []
-total_sip_contrib = 0.0
-total_lumpsum_contrib = 0.0
-
-for m in range(1, months + 1):
-    sip_amt = month_sip_amount(m)
-    if invest_at_beginning:
-        balance += sip_amt
-        total_sip_contrib += sip_amt
-    if m == 1 and lump_sum > 0 and lump_sum_timing == "Invest today (t=0)":
-        balance += lump_sum
-        total_lumpsum_contrib += lump_sum
-    if m == 2 and lump_sum > 0 and lump_sum_timing == "Invest after 1 month":
-        balance += lump_sum
-        total_lumpsum_contrib += lump_sum
-    if r > 0:
-        balance *= (1 + r)
-    if not invest_at_beginning:
-        balance += sip_amt
-        total_sip_contrib += sip_amt
-    rows.append({
-        "Month": m,
-        "SIP this month (₹)": sip_amt,
-        "Cumulative SIP (₹)": total_sip_contrib,
-        "Cumulative Lump-sum (₹)": total_lumpsum_contrib,
-        "Total Principal (₹)": total_sip_contrib + total_lumpsum_contrib,
-        "Estimated Value (₹)": balance
-    })
-
-df = pd.DataFrame(rows) if rows else pd.DataFrame(columns=["Month","SIP this month (₹)","Cumulative SIP (₹)","Cumulative Lump-sum (₹)","Total Principal (₹)","Estimated Value (₹)"])
-principal = float(df["Total Principal (₹)"].iloc[-1]) if not df.empty else float(lump_sum)
-future_value = float(df["Estimated Value (₹)"].iloc[-1]) if not df.empty else principal
-returns = max(future_value - principal, 0.0)
+kpis = st.session_state["kpis"]
+df = st.session_state.get("schedule")
 
 # ---------------- OUTPUT DISPLAY ----------------
 with col_output:
@@ -266,10 +65,10 @@ with col_output:
     
     # KPIs
     k1, k2, k3, k4 = st.columns(4)
-    k1.metric("Lump-sum Invested", format_indian_currency(total_lumpsum_contrib))
-    k2.metric("Total SIP Invested", format_indian_currency(total_sip_contrib))
-    k3.metric("Estimated Value", format_indian_currency(future_value))
-    k4.metric("Wealth Gain (Returns)", format_indian_currency(returns))
+    k1.metric("Lump-sum Invested", format_indian_currency(kpis["lumpsum"]))
+    k2.metric("Total SIP Invested", format_indian_currency(kpis["sip"]))
+    k3.metric("Estimated Value", format_indian_currency(kpis["future_value"]))
+    k4.metric("Wealth Gain (Returns)", format_indian_currency(kpis["returns"]))
 
     st.markdown("") # Spacer
 
@@ -278,128 +77,36 @@ with col_output:
     
     with c1:
         st.caption("Principal vs Returns".upper())
-        pie_data = [{"Type": "Principal", "Value": principal}, {"Type": "Returns", "Value": returns}]
-        fig_pie = px.pie(
-            pie_data, names="Type", values="Value", hole=0.7,
-            color="Type",
-            color_discrete_map={"Principal": "#6B5B45", "Returns": "#BB9D63"} # muted brown vs bright gold
-        )
-        fig_pie.update_traces(textposition="outside", textinfo="percent+label")
-        fig_pie.update_layout(
-            margin=dict(t=20, b=50, l=40, r=40),
-            height=300,
-            paper_bgcolor="rgba(0,0,0,0)",
-            plot_bgcolor="rgba(0,0,0,0)",
-            font=dict(color="#F0EAD6", family="Montserrat", size=10),
-            showlegend=True,
-            legend=dict(orientation="h", y=-0.2, x=0.5, xanchor="center")
-        )
-        st.plotly_chart(fig_pie, use_container_width=True)
+        png = pie_png(kpis["principal"], kpis["returns"])
+        if png is not None:
+            st.image(png, use_container_width=True)
+        else:
+            # kaleido or its headless Chrome is unavailable: fall back to the interactive chart
+            st.plotly_chart(build_pie_figure(kpis["principal"], kpis["returns"]), use_container_width=True)
 
     with c2:
-        if not df.empty:
+        if show_monthly and not df.empty:
             st.caption("Monthly Growth".upper())
-            line_fig = px.area(
-                df, x="Month", y=["Total Principal (₹)", "Estimated Value (₹)"],
-                labels={"value": "Amount (₹)", "variable": "Metric"},
-                color_discrete_sequence=["#5D4D3B", "#BB9D63"] # Dark Bronze vs Gold
-            )
-            line_fig.update_layout(
-                margin=dict(t=10, b=0, l=0, r=0),
-                height=300,
-                legend=dict(orientation="h", y=1.02, x=1, xanchor="right"),
-                paper_bgcolor="rgba(0,0,0,0)",
-                plot_bgcolor="rgba(0,0,0,0)",
-                font=dict(color="#A89F91", family="Montserrat", size=10),
-                xaxis=dict(showgrid=False),
-                yaxis=dict(showgrid=True, gridcolor="rgba(212, 175, 55, 0.1)"),
-                hovermode="x unified"
-            )
-            st.plotly_chart(line_fig, use_container_width=True)
+            st.plotly_chart(build_area_figure(df), use_container_width=True)
 
     # ---------------- Monthly Growth Table ----------------
     if show_monthly and not df.empty:
-        st.caption("Monthly Growth".upper())
-        st.dataframe(
-            df, 
-            hide_index=True, 
-            use_container_width=True,
-            column_config={
-                "SIP this month (₹)": st.column_config.NumberColumn(format="%.2f"),
-                "Cumulative SIP (₹)": st.column_config.NumberColumn(format="%.2f"),
-                "Cumulative Lump-sum (₹)": st.column_config.NumberColumn(format="%.2f"),
-                "Total Principal (₹)": st.column_config.NumberColumn(format="%.2f"),
-                "Estimated Value (₹)": st.column_config.NumberColumn(format="%.2f"),
-            }
-        )
+        # The grid is only built while the expander is open; opening/closing it triggers a rerun
+        table_expander = st.expander("Monthly Growth Table".upper(), key="show_schedule_table", on_change="rerun")
+        with table_expander:
+            if table_expander.open:
+                st.dataframe(
+                    df, 
+                    hide_index=True, 
+                    use_container_width=True,
+                    column_config={
+                        "SIP this month (₹)": st.column_config.NumberColumn(format="%.2f"),
+                        "Cumulative SIP (₹)": st.column_config.NumberColumn(format="%.2f"),
+                        "Cumulative Lump-sum (₹)": st.column_config.NumberColumn(format="%.2f"),
+                        "Total Principal (₹)": st.column_config.NumberColumn(format="%.2f"),
+                        "Estimated Value (₹)": st.column_config.NumberColumn(format="%.2f"),
+                    }
+                )
 
         # CSV download
-        csv = df.to_csv(index=False).encode("utf-8-sig")
-        st.download_button("Download Monthly Schedule (CSV)", csv, "sip_schedule.csv", "text/csv")
-
-
-# ---------------- ELEMENTS REMOVAL SCRIPT (ROBUST + HEADER KILLER) ----------------
-components.html(
-    """
-    <script>
-    function removeElements() {
-        const doc = window.parent.document;
-        
-        // 1. Target the Specific Nuisance Elements
-        const specificSelectors = [
-            '._viewerBadge_nim44_23',
-            '._container_gzau3_1',
-            'a[href*="streamlit.io/cloud"]',
-            '[class*="viewerBadge"]',
-            '._profileContainer_gzau3_53',
-            'div[class*="profileContainer"]',
-            '._profilePreview_gzau3_63',
-            '._profileImage_gzau3_78',
-            'a[href*="share.streamlit.io/user"]'
-        ];
-        
-        // 2. Target the Entire Header Area (The Nuclear Option)
-        const nuclearSelectors = [
-            'header[data-testid="stHeader"]',
-            '[data-testid="stToolbar"]',
-            '[data-testid="stDecoration"]'
-        ];
-        
-        const allSelectors = [...specificSelectors, ...nuclearSelectors];
-        
-        allSelectors.forEach(selector => {
-            const elements = doc.querySelectorAll(selector);
-            elements.forEach(el => {
-                if(el) {
-                    // Hide it
-                    el.style.display = 'none';
-                    el.style.visibility = 'hidden';
-                    el.style.height = '0';
-                    el.style.zIndex = '-100';
-                    // Remove it
-                    el.remove();
-                }
-            });
-        });
-        
-        // 3. Adjust Top Padding of main container to reclaim space
-        const mainBlock = doc.querySelector('.block-container');
-        if(mainBlock) {
-             mainBlock.style.paddingTop = '1rem';
-        }
-    }
-
-    // Interval + Observer
-    const intervalId = setInterval(removeElements, 50);
-    const observer = new MutationObserver((mutations) => {
-        removeElements();
-    });
-    observer.observe(window.parent.document.body, {childList: true, subtree: true});
-
-    // Keep it running for a while
-    setTimeout(() => clearInterval(intervalId), 60000);
-    </script>
-    """,
-    height=0,
-    width=0
-)
+        st.download_button("Download Monthly Schedule (CSV)", schedule_csv(df), "sip_schedule.csv", "text/csv")
@@ -1,7 +1,197 @@
 # swp_calculator.py
+import math
+import numpy as np
 import pandas as pd
-import plotly.express as px
+import plotly.graph_objects as go
 import streamlit as st
+from core import schedule_csv
+
+try:
+    from numba import njit
+except ImportError:  # numba is optional; the NumPy closed form below is used instead
+    njit = None
+
+# ---------------- Simulation ----------------
+# Every runner takes som=True for start-of-month (False: end-of-month) withdrawals and returns
+# (opening, withdrawal, growth, closing, months_run); callers slice the arrays to months_run.
+
+def _phase_factors(r_m, w_m, som):
+    # Each month is linear in its opening corpus, so one multiplier per quantity and phase:
+    # closing = opening * g_grow (growth only) or opening * g_with (withdrawing), and
+    # while withdrawing, withdrawal = opening * wd_coef and growth = opening * gr_coef.
+    g_grow = 1.0 + r_m
+    g_with = (1.0 + r_m) * (1.0 - w_m)   # same for start- and end-of-month withdrawals
+    if som:
+        # Withdraw first, then grow
+        wd_coef, gr_coef = w_m, (1.0 - w_m) * r_m
+    else:
+        # Grow first, then withdraw from grown corpus
+        wd_coef, gr_coef = (1.0 + r_m) * w_m, r_m
+    return g_grow, g_with, wd_coef, gr_coef
+
+# One month of the original loop, in its own update order, as (withdrawal, growth, closing)
+
+def _grow_month(opening, r_m):
+    growth = opening * r_m
+    return 0.0, growth, opening + growth
+
+def _som_month(opening, r_m, w_m):
+    # Withdraw first, then grow
+    withdrawal = opening * w_m
+    growth = (opening - withdrawal) * r_m
+    return withdrawal, growth, opening - withdrawal + growth
+
+def _eom_month(opening, r_m, w_m):
+    # Grow first, then withdraw from grown corpus
+    growth = opening * r_m
+    withdrawal = (opening + growth) * w_m
+    return withdrawal, growth, opening + growth - withdrawal
+
+def _simulate_closed_form(initial, r_m, w_m, months, start_month, som):
+    g_grow, g_with, wd_coef, gr_coef = _phase_factors(r_m, w_m, som)
+
+    # The corpus only ever scales by a constant factor, so the month it runs out is known up front:
+    # the first withdrawal month if one month takes everything (g_with <= 0), otherwise about when
+    # g_with**k underflows to zero. That month sizes the columns, which are filled per phase slice.
+    grow_months = start_month - 1
+    with np.errstate(over="ignore"):
+        withdraw_start = initial * np.power(g_grow, grow_months)   # inf if the growth phase overflows
+    if not np.isfinite(withdraw_start):
+        bound = months
+    elif g_with <= 0:
+        bound = min(start_month, months)
+    elif g_with < 1:
+        zero_below = math.log(np.finfo(float).smallest_subnormal)
+        bound = min(grow_months + math.floor((zero_below - math.log(withdraw_start)) / math.log(g_with)) + 3, months)
+    else:
+        bound = months
+
+    opening = np.empty(bound)
+    withdrawal = np.empty(bound)
+    growth = np.empty(bound)
+    closing = np.empty(bound)
+    with np.errstate(over="ignore", under="ignore", invalid="ignore"):
+        opening[:grow_months] = initial * np.power(g_grow, np.arange(grow_months))
+        opening[grow_months:] = withdraw_start * np.power(g_with, np.arange(bound - grow_months))
+
+        withdrawal[:grow_months] = 0.0
+        np.multiply(opening[:grow_months], r_m, out=growth[:grow_months])
+        np.multiply(opening[:grow_months], g_grow, out=closing[:grow_months])
+        np.multiply(opening[grow_months:], wd_coef, out=withdrawal[grow_months:])
+        np.multiply(opening[grow_months:], gr_coef, out=growth[grow_months:])
+        np.multiply(opening[grow_months:], g_with, out=closing[grow_months:])
+
+    # The geometric form only tracks the loop while the corpus stays a normal, finite float. If it does
+    # not (depleted, underflowing, or overflowing once grown), rounding decides the month the corpus hits
+    # zero, or where inf - inf turns it nan, so the schedule is replayed in the loop's own update order.
+    # Only extreme rates get here, e.g. withdrawals of ~840%/yr or more underflowing within the horizon.
+    with np.errstate(over="ignore"):
+        grown = opening[grow_months:] * g_grow
+    if np.all((closing[grow_months:] >= np.finfo(float).tiny) & (grown < np.inf)):
+        return opening, withdrawal, growth, closing, bound
+
+    month = _som_month if som else _eom_month
+    balance = float(initial)
+    for i in range(bound):
+        opening[i] = balance
+        if i < grow_months:
+            withdrawal[i], growth[i], balance = _grow_month(balance, r_m)
+        else:
+            withdrawal[i], growth[i], balance = month(balance, r_m, w_m)
+        closing[i] = balance
+        if balance <= 0:
+            return opening, withdrawal, growth, closing, i + 1
+    if bound < months:
+        closing[bound - 1] = 0.0   # past the underflow estimate: the corpus is gone either way
+    return opening, withdrawal, growth, closing, bound
+
+if njit is not None:
+    # One kernel per withdrawal timing so neither the timing nor the phase is branched on per month.
+    # The kernels step through the same month functions as the closed form's replay, so rounding
+    # (and the month the corpus runs out) matches the original loop exactly.
+    _grow_step = njit(cache=True)(_grow_month)
+    _som_step = njit(cache=True)(_som_month)
+    _eom_step = njit(cache=True)(_eom_month)
+
+    @njit(cache=True)
+    def _grow_only(opening_a, withdrawal_a, growth_a, closing_a, balance, r_m, n):
+        # Months before withdrawals start; a positive corpus cannot deplete here
+        for i in range(n):
+            opening_a[i] = balance
+            withdrawal_a[i], growth_a[i], balance = _grow_step(balance, r_m)
+            closing_a[i] = balance
+        return balance
+
+    @njit(cache=True)
+    def _run_som(initial, r_m, w_m, months, start_month):
+        opening_a = np.empty(months, dtype=np.float64)
+        withdrawal_a = np.empty(months, dtype=np.float64)
+        growth_a = np.empty(months, dtype=np.float64)
+        closing_a = np.empty(months, dtype=np.float64)
+        balance = _grow_only(opening_a, withdrawal_a, growth_a, closing_a, initial, r_m, start_month - 1)
+        for i in range(start_month - 1, months):
+            opening_a[i] = balance
+            withdrawal_a[i], growth_a[i], balance = _som_step(balance, r_m, w_m)
+            closing_a[i] = balance
+            if balance <= 0:
+                return opening_a, withdrawal_a, growth_a, closing_a, i + 1
+        return opening_a, withdrawal_a, growth_a, closing_a, months
+
+    @njit(cache=True)
+    def _run_eom(initial, r_m, w_m, months, start_month):
+        opening_a = np.empty(months, dtype=np.float64)
+        withdrawal_a = np.empty(months, dtype=np.float64)
+        growth_a = np.empty(months, dtype=np.float64)
+        closing_a = np.empty(months, dtype=np.float64)
+        balance = _grow_only(opening_a, withdrawal_a, growth_a, closing_a, initial, r_m, start_month - 1)
+        for i in range(start_month - 1, months):
+            opening_a[i] = balance
+            withdrawal_a[i], growth_a[i], balance = _eom_step(balance, r_m, w_m)
+            closing_a[i] = balance
+            if balance <= 0:
+                return opening_a, withdrawal_a, growth_a, closing_a, i + 1
+        return opening_a, withdrawal_a, growth_a, closing_a, months
+
+    def _run_schedule(initial, r_m, w_m, months, start_month, som):
+        run = _run_som if som else _run_eom
+        return run(initial, r_m, w_m, months, start_month)
+else:
+    _run_schedule = _simulate_closed_form
+
+@st.cache_data(show_spinner=False)
+def _simulate(initial_corpus, exp_return_pa, withdraw_pct_pa, tenure_years, withdraw_start_year, withdraw_timing):
+    months = int(tenure_years * 12)
+    r_m = float(exp_return_pa) / 100.0 / 12.0                 # monthly return rate
+    w_m = float(withdraw_pct_pa) / 100.0 / 12.0               # monthly withdrawal rate
+    start_month = (int(withdraw_start_year) - 1) * 12 + 1     # 1, 13, 25, ...
+
+    if initial_corpus <= 0:
+        # Nothing to grow or withdraw: a single "Depleted" month
+        months_simulated = 1
+        opening = withdrawal = growth = closing = np.zeros(1)
+        phase = np.array(["Depleted"])
+    else:
+        som = withdraw_timing == "Start of month"
+        opening, withdrawal, growth, closing, months_simulated = _run_schedule(
+            float(initial_corpus), r_m, w_m, months, start_month, som
+        )
+        phase = np.where(np.arange(1, months_simulated + 1) >= start_month, "Withdrawal", "Growth only")
+
+    total_withdrawn = float(withdrawal[:months_simulated].sum())
+    # Raw values; the table's column_config formats to 2 decimals and the CSV export rounds
+    df = pd.DataFrame({
+        "Month": np.arange(1, months_simulated + 1),
+        "Opening Corpus (₹)": opening[:months_simulated],
+        "Withdrawal (₹)": withdrawal[:months_simulated],
+        "Growth (₹)": growth[:months_simulated],
+        "Closing Corpus (₹)": closing[:months_simulated],
+        "Phase": phase
+    })
+    ending_corpus = float(df["Closing Corpus (₹)"].iloc[-1]) if not df.empty else 0.0
+
+    # Month fits in int16; money columns stay float64 for the table and CSV, only the chart downcasts
+    df["Month"] = df["Month"].astype(np.int16)
+    return df, total_withdrawn, ending_corpus, months_simulated
 
 st.set_page_config(page_title="SWP Calculator", page_icon="💸", layout="centered")
 
@@ -43,69 +233,9 @@ try:
         st.error("⚠️ 'Withdrawal starts from Year' cannot be greater than the total tenure. Reduce the start year or increase tenure.")
         st.stop()
 
-    months = int(tenure_years * 12)
-    r_m = float(exp_return_pa) / 100.0 / 12.0                 # monthly return rate
-    w_m = float(withdraw_pct_pa) / 100.0 / 12.0               # monthly withdrawal rate
-    start_month = (int(withdraw_start_year) - 1) * 12 + 1     # 1, 13, 25, ...
-
-    rows = []
-    balance = float(initial_corpus)
-    total_withdrawn = 0.0
-    months_simulated = 0
-
-    for m in range(1, months + 1):
-        opening = balance
-        if opening <= 0:
-            rows.append({
-                "Month": m,
-                "Opening Corpus (₹)": 0.0,
-                "Withdrawal (₹)": 0.0,
-                "Growth (₹)": 0.0,
-                "Closing Corpus (₹)": 0.0,
-                "Phase": "Depleted"
-            })
-            months_simulated = m
-            break
-
-        withdrawals_active = (m >= start_month)
-
-        if not withdrawals_active:
-            # Growth-only phase
-            withdrawal = 0.0
-            growth = opening * r_m
-            balance = opening + growth
-            phase = "Growth only"
-        else:
-            if withdraw_timing == "Start of month":
-                # Withdraw first, then grow
-                withdrawal = opening * w_m
-                after_withdraw = opening - withdrawal
-                growth = after_withdraw * r_m
-                balance = after_withdraw + growth
-            else:
-                # Grow first, then withdraw from grown corpus
-                growth = opening * r_m
-                mid = opening + growth
-                withdrawal = mid * w_m
-                balance = mid - withdrawal
-            total_withdrawn += withdrawal
-            phase = "Withdrawal"
-
-        months_simulated = m
-        rows.append({
-            "Month": m,
-            "Opening Corpus (₹)": round(opening, 2),
-            "Withdrawal (₹)": round(withdrawal, 2),
-            "Growth (₹)": round(growth, 2),
-            "Closing Corpus (₹)": round(balance, 2),
-            "Phase": phase
-        })
-
-        if balance <= 0:
-            break
-
-    df = pd.DataFrame(rows)
-    ending_corpus = float(df["Closing Corpus (₹)"].iloc[-1]) if not df.empty else 0.0
+    df, total_withdrawn, ending_corpus, months_simulated = _simulate(
+        initial_corpus, exp_return_pa, withdraw_pct_pa, tenure_years, withdraw_start_year, withdraw_timing
+    )
 
     # ---------------- KPIs ----------------
     k1, k2, k3, k4 = st.columns(4)
@@ -129,36 +259,67 @@ try:
 
     # ---------------- Table & Chart ----------------
     if show_table and not df.empty:
-        st.subheader("Monthly Schedule")
+        money_format = st.column_config.NumberColumn(format="₹ %,.2f")
+
+        # Year-level view by default; the full monthly grid is only sent while its expander is open
+        st.subheader("Yearly Schedule")
+        yearly = (
+            df.groupby((df["Month"] - 1) // 12 + 1)
+            .agg(**{
+                "Opening Corpus (₹)": ("Opening Corpus (₹)", "first"),
+                "Withdrawal (₹)": ("Withdrawal (₹)", "sum"),
+                "Growth (₹)": ("Growth (₹)", "sum"),
+                "Closing Corpus (₹)": ("Closing Corpus (₹)", "last"),
+                "Phase": ("Phase", "last"),
+            })
+            .rename_axis("Year")
+            .reset_index()
+        )
         st.dataframe(
-            df,
+            yearly,
             hide_index=True,
             use_container_width=True,
             column_config={
-                "Month": st.column_config.NumberColumn(format="%d"),
-                "Opening Corpus (₹)": st.column_config.NumberColumn(format="₹ %,.2f"),
-                "Withdrawal (₹)": st.column_config.NumberColumn(format="₹ %,.2f"),
-                "Growth (₹)": st.column_config.NumberColumn(format="₹ %,.2f"),
-                "Closing Corpus (₹)": st.column_config.NumberColumn(format="₹ %,.2f"),
+                "Year": st.column_config.NumberColumn(format="%d"),
+                "Opening Corpus (₹)": money_format,
+                "Withdrawal (₹)": money_format,
+                "Growth (₹)": money_format,
+                "Closing Corpus (₹)": money_format,
                 "Phase": st.column_config.TextColumn(),
             },
         )
 
+        monthly_expander = st.expander("Show monthly detail", key="show_monthly_detail", on_change="rerun")
+        with monthly_expander:
+            if monthly_expander.open:
+                st.dataframe(
+                    df,
+                    hide_index=True,
+                    use_container_width=True,
+                    column_config={
+                        "Month": st.column_config.NumberColumn(format="%d"),
+                        "Opening Corpus (₹)": money_format,
+                        "Withdrawal (₹)": money_format,
+                        "Growth (₹)": money_format,
+                        "Closing Corpus (₹)": money_format,
+                        "Phase": st.column_config.TextColumn(),
+                    },
+                )
+
         st.subheader("Corpus & Withdrawals Over Time")
-        melted = df.melt(id_vars=["Month"], value_vars=["Closing Corpus (₹)", "Withdrawal (₹)"],
-                         var_name="Series", value_name="Amount")
-        fig = px.line(
-            melted, x="Month", y="Amount", color="Series",
-            labels={"Amount": "Amount (₹)"}
-        )
-        fig.update_yaxes(tickformat=",.0f")
-        fig.update_traces(hovertemplate="Month %{x}: ₹ %{y:,.2f}<extra></extra>")
-        fig.update_layout(margin=dict(t=10, b=10, l=10, r=10))
+        fig = go.Figure()
+        # Plot-only copies in float32 halve the trace payload; the table and CSV keep float64
+        month = df["Month"].to_numpy()
+        fig.add_trace(go.Scattergl(x=month, y=df["Closing Corpus (₹)"].to_numpy(dtype=np.float32), name="Closing Corpus (₹)", mode="lines"))
+        fig.add_trace(go.Scattergl(x=month, y=df["Withdrawal (₹)"].to_numpy(dtype=np.float32), name="Withdrawal (₹)", mode="lines"))
+        fig.update_yaxes(tickformat=",.0f", hoverformat=",.2f", title="Amount (₹)")
+        fig.update_xaxes(title="Month")
+        # One shared hover label per month instead of per-point hover on every trace
+        fig.update_layout(margin=dict(t=10, b=10, l=10, r=10), legend_title_text="Series", hovermode="x unified")
         st.plotly_chart(fig, use_container_width=True)
 
         # CSV download
-        csv = df.to_csv(index=False).encode("utf-8")
-        st.download_button("Download Schedule (CSV)", csv, "swp_schedule.csv", "text/csv")
+        st.download_button("Download Schedule (CSV)", schedule_csv(df), "swp_schedule.csv", "text/csv")
 
 except Exception as e:
     # Surface any hidden errors in the UI so the page never looks "empty"